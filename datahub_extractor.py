@@ -8,14 +8,22 @@ import os
 import json
 import hashlib
 import logging
+import mmap
+import sqlite3
 import requests
 import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from collections import defaultdict
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
-from typing import Dict, List, Set, Optional
-from bs4 import BeautifulSoup
-import schedule
+from typing import Dict, List, Set, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html
+from apscheduler.schedulers.blocking import BlockingScheduler
 import time
 
 
@@ -27,8 +35,33 @@ BACKOFF_MAX_SECONDS = 30 * 60  # cap at 30 minutes
 # Log retention (cleanup logs older than this)
 LOG_RETENTION_DAYS = 90        # Keep 3 months of logs
 
+# HTTP concurrency
+DOWNLOAD_WORKERS = 8           # parallel file downloads per visa type
+HTTP_POOL_SIZE = 16            # pooled keep-alive connections per host
+HTTP_RETRIES = 3               # transport-level retries per request
 
-def setup_logging(log_dir: Path):
+# File types linked from the hub pages
+FILE_EXTENSIONS = ('.csv', '.xls', '.xlsx', '.zip')
+
+# Anchors whose href path (query/fragment stripped, lowercased) ends in one of
+# FILE_EXTENSIONS; the whole filter runs inside libxml2
+_HREF_PATH = ("translate(substring-before(concat(substring-before(concat(@href, '#'), '#'), '?'), '?'), "
+              "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')")
+FILE_LINKS_XPATH = etree.XPath('//a[@href][{}]'.format(' or '.join(
+    f"substring({_HREF_PATH}, string-length({_HREF_PATH}) - {len(ext) - 1}) = '{ext}'"
+    for ext in FILE_EXTENSIONS
+)))
+
+# Download progress is logged each time this many more bytes arrive
+PROGRESS_LOG_BYTES = 1 << 23   # 8 MiB
+
+# Files at least this large are hashed through mmap instead of buffered reads
+MMAP_THRESHOLD_BYTES = 1 << 20  # 1 MiB
+HASH_BUFFER_BYTES = 65536      # reusable read buffer when mmap is unavailable
+HASH_WORKERS = 4               # files verified concurrently during cleanup (1 = sequential)
+
+
+def setup_logging(log_dir: Path) -> logging.Logger:
     """Configure logging with rotation."""
     log_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -44,7 +77,7 @@ def setup_logging(log_dir: Path):
     )
     return logging.getLogger(__name__)
 
-logger = None  
+logger = logging.getLogger(__name__)  # handlers attached by setup_logging
 
 
 class USCISDataScraper:
@@ -64,9 +97,13 @@ class USCISDataScraper:
             download_dir: Directory to store downloaded files
         """
         self.download_dir = Path(download_dir)
+        self.db_file = self.download_dir / 'scraper.db'
+        self.hub_cache_file = self.download_dir / 'hub_cache.json'
+        self.log_dir = self.download_dir / 'logs'
+        
+        # Pre-SQLite stores, imported once into db_file
         self.metadata_file = self.download_dir / 'metadata.json'
         self.checksums_file = self.download_dir / 'checksums.json'
-        self.log_dir = self.download_dir / 'logs'
         
         # Setup logging
         global logger
@@ -76,96 +113,268 @@ class USCISDataScraper:
         for visa_type in ['h1b', 'h2a', 'h2b']:
             (self.download_dir / visa_type).mkdir(parents=True, exist_ok=True)
         
-        # Load existing metadata
+        # Guards the database and metadata against concurrent download workers
+        self._lock = threading.Lock()
+        
+        # Open the metadata/checksum store and load existing metadata
+        self._db = self._open_db()
         self.metadata = self._load_metadata()
-        self.checksums = self._load_checksums()
+        self.hub_cache = self._load_hub_cache()
+        
+        # Shared session so all requests reuse pooled keep-alive connections
+        self.session = self._create_session()
         
         logger.info(f"Initialized scraper with download directory: {self.download_dir}")
     
-    def _load_metadata(self) -> Dict:
-        """Load metadata from file."""
+    def _create_session(self) -> requests.Session:
+        """Create an HTTP session with connection pooling and retries."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=HTTP_RETRIES, backoff_factor=0.5)
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _open_db(self) -> sqlite3.Connection:
+        """
+        Open the SQLite store for metadata and checksums.
+        
+        Runs in autocommit mode with WAL journaling, so every insert is
+        durable on its own without rewriting the whole store.
+        """
+        db = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute('CREATE TABLE IF NOT EXISTS metadata (url TEXT PRIMARY KEY, meta TEXT NOT NULL)')
+        db.execute('CREATE TABLE IF NOT EXISTS checksums (hash TEXT PRIMARY KEY, url TEXT NOT NULL)')
+        
+        # user_version marks the legacy import as done, so entries removed later
+        # (e.g. by cleanup) are not re-imported from metadata.json on every start
+        if db.execute('PRAGMA user_version').fetchone()[0] == 0:
+            if (db.execute('SELECT 1 FROM metadata LIMIT 1').fetchone() is None
+                    and db.execute('SELECT 1 FROM checksums LIMIT 1').fetchone() is None):
+                self._migrate_legacy_files(db)
+            db.execute('PRAGMA user_version = 1')
+        return db
+    
+    def _migrate_legacy_files(self, db: sqlite3.Connection):
+        """Import metadata.json and checksums.json into a new database."""
+        metadata = {}
         if self.metadata_file.exists():
             try:
                 with open(self.metadata_file, 'r') as f:
-                    return json.load(f)
+                    metadata = json.load(f)
             except Exception as e:
-                logger.error(f"Error loading metadata: {e}")
-                return {}
-        return {}
-    
-    def _load_checksums(self) -> Dict:
-        """Load checksums from file."""
+                logger.error(f"Error loading legacy metadata: {e}")
+        
+        checksums = {}
         if self.checksums_file.exists():
             try:
                 with open(self.checksums_file, 'r') as f:
+                    checksums = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading legacy checksums: {e}")
+        
+        if not metadata and not checksums:
+            return
+        
+        db.execute('BEGIN')
+        db.executemany('INSERT OR REPLACE INTO metadata (url, meta) VALUES (?, ?)',
+                       ((url, json.dumps(meta, sort_keys=True)) for url, meta in metadata.items()))
+        db.executemany('INSERT OR REPLACE INTO checksums (hash, url) VALUES (?, ?)', checksums.items())
+        db.execute('COMMIT')
+        logger.info(f"Migrated {len(metadata)} metadata entries and {len(checksums)} checksums to {self.db_file.name}")
+    
+    @contextmanager
+    def _transaction(self):
+        """Group several database writes into one atomic transaction."""
+        self._db.execute('BEGIN')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+    
+    def _load_metadata(self) -> Dict:
+        """Load metadata from the database."""
+        try:
+            return {url: json.loads(meta)
+                    for url, meta in self._db.execute('SELECT url, meta FROM metadata')}
+        except Exception as e:
+            logger.error(f"Error loading metadata: {e}")
+            return {}
+    
+    def _load_hub_cache(self) -> Dict:
+        """Load cached hub page validators and links from file."""
+        if self.hub_cache_file.exists():
+            try:
+                with open(self.hub_cache_file, 'r') as f:
                     return json.load(f)
             except Exception as e:
-                logger.error(f"Error loading checksums: {e}")
+                logger.error(f"Error loading hub cache: {e}")
                 return {}
         return {}
     
-    def _save_metadata(self):
-        """Atomically save metadata to file."""
-        temp_file = self.metadata_file.with_suffix('.tmp')
-        try:
-            with open(temp_file, 'w') as f:
-                json.dump(self.metadata, f, indent=2, sort_keys=True)
-            temp_file.replace(self.metadata_file)
-            logger.info("Metadata saved successfully")
-        except Exception as e:
-            logger.error(f"Error saving metadata: {e}")
-            if temp_file.exists():
-                temp_file.unlink()
+    def _put_metadata(self, url: str, meta: Dict):
+        """Insert or update the metadata entry for a URL."""
+        self.metadata[url] = meta
+        self._db.execute('INSERT OR REPLACE INTO metadata (url, meta) VALUES (?, ?)',
+                         (url, json.dumps(meta, sort_keys=True)))
+    
+    def _delete_metadata(self, url: str):
+        """Remove the metadata entry for a URL."""
+        self.metadata.pop(url, None)
+        self._db.execute('DELETE FROM metadata WHERE url = ?', (url,))
+    
+    def _put_checksum(self, checksum: str, url: str):
+        """Record the URL a checksum was first downloaded from."""
+        self._db.execute('INSERT OR REPLACE INTO checksums (hash, url) VALUES (?, ?)', (checksum, url))
+    
+    def _delete_checksum(self, checksum: str, url: Optional[str] = None):
+        """Remove a checksum, optionally only if it belongs to url."""
+        if url is None:
+            self._db.execute('DELETE FROM checksums WHERE hash = ?', (checksum,))
+        else:
+            self._db.execute('DELETE FROM checksums WHERE hash = ? AND url = ?', (checksum, url))
     
-    def _save_checksums(self):
-        """Atomically save checksums to file."""
-        temp_file = self.checksums_file.with_suffix('.tmp')
+    def _save_hub_cache(self):
+        """Atomically save the hub page cache to file."""
+        temp_file = self.hub_cache_file.with_suffix('.tmp')
         try:
             with open(temp_file, 'w') as f:
-                json.dump(self.checksums, f, indent=2, sort_keys=True)
-            temp_file.replace(self.checksums_file)
-            logger.info("Checksums saved successfully")
+                json.dump(self.hub_cache, f, indent=2, sort_keys=True)
+            temp_file.replace(self.hub_cache_file)
+            logger.info("Hub cache saved successfully")
         except Exception as e:
-            logger.error(f"Error saving checksums: {e}")
+            logger.error(f"Error saving hub cache: {e}")
             if temp_file.exists():
                 temp_file.unlink()
     
     def _calculate_checksum(self, filepath: Path) -> str:
-        """Calculate SHA-256 checksum of a file."""
-        sha256_hash = hashlib.sha256()
+        """
+        Calculate SHA-256 checksum of a file.
+        
+        Small files are read whole; larger files are mapped and hashed in
+        place so pages come in through kernel readahead without copies.
+        If the file cannot be mapped, it is streamed through one reusable
+        buffer so no per-chunk bytes objects are allocated.
+        """
         with open(filepath, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+            if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD_BYTES:
+                return hashlib.sha256(f.read()).hexdigest()
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    return hashlib.sha256(mm).hexdigest()
+            except (OSError, ValueError):
+                pass
+            
+            sha256_hash = hashlib.sha256()
+            buf = bytearray(HASH_BUFFER_BYTES)
+            view = memoryview(buf)
+            while (n := f.readinto(buf)):
+                sha256_hash.update(view[:n])
+            return sha256_hash.hexdigest()
     
-    def _is_duplicate(self, url: str, filepath: Path) -> bool:
+    def _calculate_checksums(self, filepaths: List[Path]) -> List[str]:
+        """
+        Calculate SHA-256 checksums for a batch of files.
+        
+        hashlib releases the GIL while hashing, so several files can be
+        read and hashed at once, keeping multiple reads in flight.
+        
+        Args:
+            filepaths: Files to hash
+            
+        Returns:
+            Checksums in the same order as filepaths
+        """
+        if HASH_WORKERS <= 1 or len(filepaths) <= 1:
+            return [self._calculate_checksum(path) for path in filepaths]
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            return list(executor.map(self._calculate_checksum, filepaths))
+    
+    def _is_duplicate(self, url: str, checksum: str) -> bool:
         """
         Check if file is a duplicate based on URL and checksum.
         
+        A known URL whose content has changed is not a duplicate, so the
+        new version replaces the old one.
+        
         Args:
             url: URL of the file
-            filepath: Path to the downloaded file
+            checksum: SHA-256 checksum of the downloaded content
             
         Returns:
             True if file is a duplicate, False otherwise
         """
-        # Check if URL already exists in metadata
-        if url in self.metadata:
-            logger.info(f"URL already in metadata: {url}")
+        # Check if URL already exists in metadata with the same content
+        known = self.metadata.get(url)
+        if known is not None and known['checksum'] == checksum:
+            logger.info("URL already in metadata: %s", url)
             return True
         
-        # Calculate checksum and check for duplicates
-        checksum = self._calculate_checksum(filepath)
-        if checksum in self.checksums:
-            logger.info(f"Duplicate file detected (checksum match): {filepath.name}")
+        # Check for duplicate content
+        if self._db.execute('SELECT 1 FROM checksums WHERE hash = ?', (checksum,)).fetchone():
+            logger.info("Duplicate file detected (checksum match): %s", url)
             return True
         
         return False
     
+    @staticmethod
+    def _parse_content_length(value: Optional[str]) -> Optional[int]:
+        """Parse a Content-Length header, returning None if missing or malformed."""
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+    
+    def _is_unchanged(self, url: str, meta: Dict) -> bool:
+        """
+        Check with a HEAD request whether a downloaded file is unchanged.
+        
+        Args:
+            url: URL of the file
+            meta: Metadata recorded when the file was downloaded
+            
+        Returns:
+            True if the server reports the same Content-Length as the original
+            GET (and the same ETag, when both sides have one), False if
+            changed or unknown
+        """
+        try:
+            head = self.session.head(url, timeout=10, allow_redirects=True)
+            head.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("HEAD request failed for %s: %s", url, e)
+            return False
+        
+        # Content-Length is the encoded (e.g. gzip) size, so compare it with the
+        # GET's header rather than the decoded size_bytes. Older entries
+        # without that field fall back to size_bytes.
+        expected = meta['content_length'] if 'content_length' in meta else meta['size_bytes']
+        content_length = self._parse_content_length(head.headers.get('Content-Length'))
+        if content_length is None or content_length != expected:
+            return False
+        
+        etag = head.headers.get('ETag')
+        if etag and meta.get('etag') and etag != meta['etag']:
+            return False
+        
+        return True
+    
     def _extract_file_links(self, url: str) -> List[Dict[str, str]]:
         """
         Extract download links from a USCIS data hub page.
         
+        Sends a conditional GET using the validators cached from the last
+        run and reuses the cached links when the page is not modified.
+        
         Args:
             url: URL of the data hub page
             
@@ -173,96 +382,183 @@ class USCISDataScraper:
             List of dictionaries with 'url' and 'name' keys
         """
         try:
-            response = requests.get(url, timeout=30)
+            cached = self.hub_cache.get(url, {})
+            headers = {}
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+            
+            response = self.session.get(url, headers=headers, timeout=30)
+            if response.status_code == 304 and 'cached_links' in cached:
+                logger.info("Hub page not modified, reusing %d cached links: %s", len(cached['cached_links']), url)
+                return cached['cached_links']
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            tree = html.fromstring(response.content)
             links = []
             
             # Find all links to CSV or Excel files
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                # Look for CSV, XLS, XLSX files
-                if any(ext in href.lower() for ext in ['.csv', '.xls', '.xlsx', '.zip']):
-                    full_url = urljoin(url, href)
-                    link_text = link.get_text(strip=True)
-                    links.append({
-                        'url': full_url,
-                        'name': link_text or Path(urlparse(full_url).path).name
-                    })
+            for link in FILE_LINKS_XPATH(tree):
+                full_url = urljoin(url, link.get('href'))
+                link_text = link.text_content().strip()
+                links.append({
+                    'url': full_url,
+                    'name': link_text or Path(urlparse(full_url).path).name
+                })
             
-            logger.info(f"Found {len(links)} file links on {url}")
+            # Remember validators so the next run can send a conditional GET
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                with self._lock:
+                    self.hub_cache[url] = {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'cached_links': links
+                    }
+            
+            logger.info("Found %d file links on %s", len(links), url)
             return links
             
         except Exception as e:
-            logger.error(f"Error extracting links from {url}: {e}")
+            logger.error("Error extracting links from %s: %s", url, e)
             return []
     
-    def _download_file(self, url: str, dest_path: Path) -> bool:
+    def _download_file(self, url: str, dest_path: Path, visa_type: Optional[str] = None) -> bool:
         """
         Download a file with progress tracking.
         
         Args:
             url: URL of the file to download
             dest_path: Destination path for the downloaded file
+            visa_type: Visa type recorded in the file's metadata
             
         Returns:
             True if download successful, False otherwise
         """
-        tmp_path = None
+        fetched = self._fetch_file(url, dest_path.name)
+        return fetched is not None and self._store_file(url, dest_path, visa_type, fetched)
+    
+    def _fetch_file(self, url: str, name: str) -> Optional[Dict]:
+        """
+        Stream a file to a temporary path, hashing it on the way.
+        
+        Safe to run concurrently; nothing is recorded until _store_file.
+        
+        Args:
+            url: URL of the file to download
+            name: Filename used in progress logging
+            
+        Returns:
+            Dict with the temporary path and the checksum, size and headers
+            measured while downloading, or None if unchanged or failed
+        """
+        tmp_path: Optional[Path] = None
         try:
+            # Skip the body transfer for known files the server reports unchanged
+            known = self.metadata.get(url)
+            if known is not None and self._is_unchanged(url, known):
+                logger.info("Unchanged since last download, skipping: %s", url)
+                return None
+            
             # Download to temporary file first
             with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-                response = requests.get(url, stream=True, timeout=60)
+                tmp_path = Path(tmp_file.name)
+                response = self.session.get(url, stream=True, timeout=60)
                 response.raise_for_status()
                 
-                total_size = int(response.headers.get('content-length', 0))
                 downloaded = 0
+                next_log = PROGRESS_LOG_BYTES
+                sha256_hash = hashlib.sha256()
                 
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(chunk_size=65536):
                     if chunk:
                         tmp_file.write(chunk)
+                        sha256_hash.update(chunk)
                         downloaded += len(chunk)
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            if downloaded % (8192 * 100) == 0:  # Log every ~800KB
-                                logger.info(f"Downloading {dest_path.name}: {progress:.1f}%")
+                        if downloaded >= next_log:
+                            logger.info("Downloading %s: %d MiB", name, downloaded >> 20)
+                            next_log += PROGRESS_LOG_BYTES
                 
-                tmp_path = Path(tmp_file.name)
+                # mtime from the open descriptor; the rename in _store_file preserves it
+                tmp_file.flush()
+                mtime_ns = os.fstat(tmp_file.fileno()).st_mtime_ns
             
-            # Check for duplicates
-            if self._is_duplicate(url, tmp_path):
-                tmp_path.unlink()
-                return False
-            
-            # Move to final destination atomically
-            tmp_path.replace(dest_path)
-            
-            # Update metadata
-            checksum = self._calculate_checksum(dest_path)
-            self.metadata[url] = {
-                'filename': dest_path.name,
-                'download_date': datetime.now().isoformat(),
-                'checksum': checksum,
-                'size_bytes': dest_path.stat().st_size
+            return {
+                'tmp_path': tmp_path,
+                'checksum': sha256_hash.hexdigest(),  # hashed while streaming
+                'size_bytes': downloaded,
+                'mtime_ns': mtime_ns,
+                'etag': response.headers.get('ETag'),
+                'content_length': self._parse_content_length(response.headers.get('Content-Length'))
             }
-            self.checksums[checksum] = url
             
-            logger.info(f"Successfully downloaded: {dest_path.name}")
+        except Exception as e:
+            logger.error("Error downloading %s: %s", url, e)
+            if tmp_path and tmp_path.exists():
+                tmp_path.unlink()
+            return None
+    
+    def _store_file(self, url: str, dest_path: Path, visa_type: Optional[str], fetched: Dict) -> bool:
+        """
+        Move a fetched file into place and record it, unless it is a duplicate.
+        
+        Args:
+            url: URL the file was fetched from
+            dest_path: Destination path for the file
+            visa_type: Visa type recorded in the file's metadata
+            fetched: Result of _fetch_file
+            
+        Returns:
+            True if the file was stored, False if duplicate or failed
+        """
+        tmp_path = fetched['tmp_path']
+        try:
+            with self._lock:
+                # Check for duplicates
+                if self._is_duplicate(url, fetched['checksum']):
+                    tmp_path.unlink()
+                    return False
+                
+                # Move to final destination atomically
+                tmp_path.replace(dest_path)
+                
+                with self._transaction():
+                    # Drop the checksum of the version being replaced
+                    previous = self.metadata.get(url)
+                    if previous is not None:
+                        self._delete_checksum(previous['checksum'], url)
+                    
+                    # Update metadata
+                    self._put_metadata(url, {
+                        'filename': dest_path.name,
+                        'download_date': datetime.now().isoformat(),
+                        'checksum': fetched['checksum'],
+                        'size_bytes': fetched['size_bytes'],
+                        'mtime_ns': fetched['mtime_ns'],
+                        'visa_type': visa_type,
+                        'etag': fetched['etag'],
+                        'content_length': fetched['content_length']
+                    })
+                    self._put_checksum(fetched['checksum'], url)
+            
+            logger.info("Successfully downloaded: %s", dest_path.name)
             return True
             
         except Exception as e:
-            logger.error(f"Error downloading {url}: {e}")
-            if tmp_path and tmp_path.exists():
+            logger.error("Error saving %s: %s", url, e)
+            if tmp_path.exists():
                 tmp_path.unlink()
             return False
     
-    def scrape_visa_type(self, visa_type: str) -> int:
+    def scrape_visa_type(self, visa_type: str, file_links: Optional[List[Dict[str, str]]] = None) -> int:
         """
         Scrape all files for a specific visa type.
         
         Args:
             visa_type: Type of visa ('h1b', 'h2a', or 'h2b')
+            file_links: Links already extracted from the hub page (fetched if None)
             
         Returns:
             Number of new files downloaded
@@ -275,15 +571,16 @@ class USCISDataScraper:
         logger.info(f"Scraping {visa_type.upper()} data from {url}")
         
         # Extract file links
-        file_links = self._extract_file_links(url)
+        if file_links is None:
+            file_links = self._extract_file_links(url)
         
         if not file_links:
             logger.warning(f"No files found for {visa_type.upper()}")
             return 0
         
-        # Download files
-        download_count = 0
+        # Build (url, destination, visa_type) jobs
         dest_dir = self.download_dir / visa_type
+        jobs = []
         
         for link in file_links:
             # Generate filename from URL if not provided
@@ -291,12 +588,14 @@ class USCISDataScraper:
             if not filename:
                 filename = f"{visa_type}_{hashlib.md5(link['url'].encode()).hexdigest()[:8]}.csv"
             
-            dest_path = dest_dir / filename
-            
-            if self._download_file(link['url'], dest_path):
-                download_count += 1
-        
-        return download_count
+            jobs.append((link['url'], dest_dir / filename, visa_type))
+        
+        # Download files concurrently over the shared session, but store them
+        # in page order so identical content always keeps the first link
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            fetched = executor.map(lambda job: self._fetch_file(job[0], job[1].name), jobs)
+            return sum(self._store_file(*job, result)
+                       for job, result in zip(jobs, fetched) if result is not None)
     
     def scrape_all(self) -> Dict[str, int]:
         """
@@ -306,14 +605,21 @@ class USCISDataScraper:
             Dictionary with counts of new files per visa type
         """
         results = {}
-        
-        for visa_type in self.BASE_URLS.keys():
-            count = self.scrape_visa_type(visa_type)
+        visa_types = list(self.BASE_URLS.keys())
+        
+        # Fetch and parse all hub pages concurrently
+        with ThreadPoolExecutor(max_workers=len(visa_types)) as executor:
+            all_links = list(executor.map(
+                self._extract_file_links,
+                [self.BASE_URLS[visa_type] for visa_type in visa_types]
+            ))
+        
+        # Metadata and checksums are committed to the database as each file lands
+        for visa_type, file_links in zip(visa_types, all_links):
+            count = self.scrape_visa_type(visa_type, file_links)
             results[visa_type] = count
         
-        # Save metadata and checksums
-        self._save_metadata()
-        self._save_checksums()
+        self._save_hub_cache()
         
         logger.info(f"Scraping complete. Results: {results}")
         return results
@@ -325,7 +631,7 @@ class USCISDataScraper:
         Returns:
             Dictionary of issues found
         """
-        issues = {
+        issues: Dict[str, List[str]] = {
             'missing_files': [],
             'checksum_mismatches': [],
             'orphaned_files': []
@@ -333,55 +639,73 @@ class USCISDataScraper:
         
         logger.info("Running cleanup and consistency checks...")
         
+        # Index files on disk once by name (visa_type folders first, then root)
+        disk_index: Dict[str, os.DirEntry] = {}
+        visa_files = []
+        for visa_type in self.BASE_URLS.keys():
+            visa_dir = self.download_dir / visa_type
+            if visa_dir.exists():
+                with os.scandir(visa_dir) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            disk_index.setdefault(entry.name, entry)
+                            visa_files.append(entry)
+        with os.scandir(self.download_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    disk_index.setdefault(entry.name, entry)
+        
+        missing: List[Tuple[str, Dict]] = []
+        to_verify = []
+        
         # Check if metadata files exist on disk
         for url, meta in list(self.metadata.items()):
-            # Find the file (could be in any visa_type folder)
-            filepath = None
-            for visa_type in self.BASE_URLS.keys():
-                potential_path = self.download_dir / visa_type / meta['filename']
-                if potential_path.exists():
-                    filepath = potential_path
-                    break
-            
-            # Also check root directory
-            if not filepath:
-                root_path = self.download_dir / meta['filename']
-                if root_path.exists():
-                    filepath = root_path
+            disk_entry = disk_index.get(meta['filename'])
             
             # Check if file exists
-            if not filepath:
+            if disk_entry is None:
                 issues['missing_files'].append(meta['filename'])
-                logger.warning(f"Missing file: {meta['filename']}")
-                # Remove from metadata
-                del self.metadata[url]
-                if meta['checksum'] in self.checksums:
-                    del self.checksums[meta['checksum']]
+                logger.warning("Missing file: %s", meta['filename'])
+                missing.append((url, meta))
+                continue
+            
+            # Unchanged size and mtime means the stored checksum still holds
+            stat = disk_entry.stat()
+            if (stat.st_size == meta['size_bytes']
+                    and stat.st_mtime_ns == meta.get('mtime_ns')):
                 continue
             
-            # Verify checksum
-            current_checksum = self._calculate_checksum(filepath)
-            if current_checksum != meta['checksum']:
-                issues['checksum_mismatches'].append(meta['filename'])
-                logger.warning(f"Checksum mismatch: {meta['filename']}")
-                # Update checksum
-                meta['checksum'] = current_checksum
-                self.checksums[current_checksum] = url
+            to_verify.append((url, meta, Path(disk_entry.path), stat))
+        
+        # Verify checksums of changed files as one batch
+        checksums = self._calculate_checksums([path for _, _, path, _ in to_verify])
+        
+        with self._lock, self._transaction():
+            # Remove missing files from metadata
+            for url, meta in missing:
+                self._delete_metadata(url)
+                self._delete_checksum(meta['checksum'], url)
+            
+            for (url, meta, _, stat), current_checksum in zip(to_verify, checksums):
+                if current_checksum != meta['checksum']:
+                    issues['checksum_mismatches'].append(meta['filename'])
+                    logger.warning("Checksum mismatch: %s", meta['filename'])
+                    # Update checksum
+                    meta['checksum'] = current_checksum
+                    self._put_checksum(current_checksum, url)
+                
+                # Remember the verified state so the next run can skip hashing
+                meta['size_bytes'] = stat.st_size
+                meta['mtime_ns'] = stat.st_mtime_ns
+                self._put_metadata(url, meta)
         
         # Check for orphaned files (files without metadata)
         tracked_files = set(meta['filename'] for meta in self.metadata.values())
-        for visa_type in self.BASE_URLS.keys():
-            visa_dir = self.download_dir / visa_type
-            if visa_dir.exists():
-                for file in visa_dir.iterdir():
-                    if file.is_file() and file.name not in tracked_files:
-                        issues['orphaned_files'].append(str(file.relative_to(self.download_dir)))
-                        logger.warning(f"Orphaned file: {file.name}")
-        
-        # Save updated metadata
-        if issues['missing_files'] or issues['checksum_mismatches']:
-            self._save_metadata()
-            self._save_checksums()
+        for entry in visa_files:
+            if entry.name not in tracked_files:
+                file = Path(entry.path)
+                issues['orphaned_files'].append(str(file.relative_to(self.download_dir)))
+                logger.warning("Orphaned file: %s", file.name)
         
         logger.info(f"Cleanup complete. Issues found: {sum(len(v) for v in issues.values())}")
         return issues
@@ -401,9 +725,9 @@ class USCISDataScraper:
                 if mtime < cutoff_date:
                     log_file.unlink()
                     removed_count += 1
-                    logger.debug(f"Removed old log: {log_file.name}")
+                    logger.debug("Removed old log: %s", log_file.name)
             except Exception as e:
-                logger.warning(f"Failed to remove {log_file.name}: {e}")
+                logger.warning("Failed to remove %s: %s", log_file.name, e)
         
         if removed_count > 0:
             logger.info(f"Removed {removed_count} old log files")
@@ -425,19 +749,27 @@ class USCISDataScraper:
             ""
         ]
         
-        # Count files by visa type
+        # Count files and sizes by visa type in a single pass
+        counts: Dict[Optional[str], int] = defaultdict(int)
+        sizes: Dict[Optional[str], int] = defaultdict(int)
+        total_bytes = 0
+        for meta in self.metadata.values():
+            visa_type = meta.get('visa_type')
+            if visa_type is None:
+                # Entries from before visa_type was recorded: classify by filename
+                filename = meta['filename'].lower()
+                visa_type = next((vt for vt in self.BASE_URLS if vt in filename), None)
+            counts[visa_type] += 1
+            sizes[visa_type] += meta['size_bytes']
+            total_bytes += meta['size_bytes']
+        
         for visa_type in self.BASE_URLS.keys():
-            count = sum(1 for meta in self.metadata.values() 
-                       if visa_type in meta['filename'].lower())
-            total_size = sum(meta['size_bytes'] for meta in self.metadata.values() 
-                           if visa_type in meta['filename'].lower())
-            
-            report_lines.append(f"{visa_type.upper()}: {count} files ({total_size / 1024 / 1024:.2f} MB)")
+            report_lines.append(f"{visa_type.upper()}: {counts[visa_type]} files ({sizes[visa_type] / 1024 / 1024:.2f} MB)")
         
         report_lines.extend([
             "",
             f"Total files: {len(self.metadata)}",
-            f"Total size: {sum(m['size_bytes'] for m in self.metadata.values()) / 1024 / 1024:.2f} MB",
+            f"Total size: {total_bytes / 1024 / 1024:.2f} MB",
             "=" * 60
         ])
         
@@ -559,18 +891,20 @@ def main():
     print("\nRunning initial scrape on startup...")
     scheduled_job_with_retry(download_dir)
     
-    # Schedule monthly runs 
-    schedule.every().month.at("02:00").do(scheduled_job_with_retry, download_dir)
+    # Schedule monthly runs; the scheduler sleeps until the next fire time.
+    # A run missed while the host was suspended or busy still happens once
+    # on wake-up instead of being skipped until next month.
+    scheduler = BlockingScheduler()
+    scheduler.add_job(scheduled_job_with_retry, 'cron', day=1, hour=2, args=[download_dir],
+                      misfire_grace_time=None, coalesce=True)
     
     print(f"\nScheduler active - will run monthly on the 1st at 2:00 AM")
     print("Press Ctrl+C to stop\n")
     
     # Keep running
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(3600)  # Check every hour
-    except KeyboardInterrupt:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
         print("\nScheduler stopped by user")
 
 
@@ -9,15 +9,88 @@ print("Script started - loading libraries...")
 
 import os
 import json
+import argparse
+import shutil
 import hashlib
+import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Set
-from bs4 import BeautifulSoup
+from typing import Dict, Iterable, Iterator, List, Set
+from lxml import etree
 import time
 import re
 
+try:
+    import orjson  # optional, much faster JSON encoding
+except ImportError:
+    orjson = None
+
+# Pagination patterns, e.g. "1 - 10 of 1667" and "?page=12"
+PAGINATION_RE = re.compile(r'\d+\s*-\s*\d+\s+of\s+\d+')
+TOTAL_ITEMS_RE = re.compile(r'of\s+(\d+)')
+PAGE_PARAM_RE = re.compile(r'page=(\d+)')
+
+# Data file extensions, checked with one endswith() on the lowercased href path
+DATA_FILE_EXTENSIONS = ('.xlsx', '.xls', '.csv', '.pdf', '.zip')
+
+# Manifest snapshots are compact unless USCIS_PRETTY=1 asks for indented JSON
+PRETTY_MANIFEST = os.environ.get('USCIS_PRETTY') == '1'
+
+# Discovery and download concurrency
+PAGE_WORKERS = 16              # pages fetched concurrently during discovery
+REQUESTS_PER_SECOND = 8        # politeness limit shared by all workers
+DOWNLOAD_WORKERS = 8           # files downloaded concurrently
+COPY_BUFFER_BYTES = 1 << 20    # write size when streaming downloads to disk
+PARSE_CHUNK_BYTES = 1 << 16    # bytes fed to the HTML parser at a time
+
+# HTTP connection pool and retry policy
+HTTP_POOL_CONNECTIONS = 32     # per-host pools kept alive
+HTTP_POOL_MAXSIZE = 64         # pooled connections per host (>= worker count)
+HTTP_RETRIES = 5
+HTTP_RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces requests at least 1/rate seconds apart."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+    
+    def wait(self):
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _iter_html(chunks: Iterable[bytes]) -> Iterator[etree._Element]:
+    """Incrementally parse HTML from byte chunks, yielding each element as it closes."""
+    parser = etree.HTMLPullParser(events=('end',))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            yield elem
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        return  # empty document
+    for _, elem in parser.read_events():
+        yield elem
+
+
 class USCISScraper:
     def __init__(self, data_dir: str = "./uscis_data", manifest_file: str = "download_manifest.json"):
         """
@@ -31,7 +104,10 @@ class USCISScraper:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         self.manifest_path = self.data_dir / manifest_file
+        self.journal_path = self.manifest_path.with_suffix('.jsonl')
         self.manifest = self._load_manifest()
+        self._manifest_lock = threading.Lock()  # guards manifest across download workers
+        self._fs_index = self._index_files()
         
         self.base_url = "https://www.uscis.gov"
         self.data_page = f"{self.base_url}/tools/reports-and-studies/immigration-and-citizenship-data"
@@ -46,97 +122,306 @@ class USCISScraper:
             'EB': ['EB Petitions', 'Priority Date', 'I-526', 'I-360', 'Approved EB', 'Visa Bulletin']
         }
         
+        # Lowercased keywords per form, so matching only lowercases the text
+        self._form_keywords = {
+            form_type: tuple(keyword.lower() for keyword in keywords)
+            for form_type, keywords in self.target_forms.items()
+        }
+        
+        # Anchor texts repeat across pages, so memoize matching per plain string
+        self._match_forms_cached = lru_cache(maxsize=4096)(self._match_forms)
+        
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            # gzip/deflate, plus br/zstd when their decoders are installed
+            'Accept-Encoding': ACCEPT_ENCODING
         })
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=HTTP_RETRIES, backoff_factor=0.5,
+                              status_forcelist=HTTP_RETRY_STATUSES)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+        self.download_limiter = None  # set by run() from delay_between_downloads
+        self._run_ts = None  # filename timestamp shared by one run() batch
+        self._print_lock = threading.Lock()  # keeps worker output lines whole
+        
+        # On-disk cache of parsed page links, revalidated with conditional GETs
+        self._page_cache = self._open_page_cache()
+        self._page_cache_lock = threading.Lock()
         
         print("Initialization complete!")
     
     def _load_manifest(self) -> Dict:
-        """Load the manifest of previously downloaded files."""
+        """
+        Load the manifest of previously downloaded files.
+        
+        Starts from the last JSON snapshot, then replays any downloads
+        journaled since (e.g. by a run that was interrupted).
+        """
         if self.manifest_path.exists():
-            with open(self.manifest_path, 'r') as f:
-                return json.load(f)
-        return {
-            'last_run': None,
-            'downloaded_files': {},
-            'stats': {'total_downloads': 0, 'skipped_duplicates': 0}
-        }
+            with open(self.manifest_path, 'rb') as f:
+                manifest = orjson.loads(f.read()) if orjson else json.load(f)
+            # Re-key entries so manifests written with older URL hashes still match
+            manifest['downloaded_files'] = {
+                self._get_file_hash(entry['url']): entry
+                for entry in manifest['downloaded_files'].values()
+            }
+        else:
+            manifest = {
+                'last_run': None,
+                'downloaded_files': {},
+                'stats': {'total_downloads': 0, 'skipped_duplicates': 0}
+            }
+        
+        if self.journal_path.exists():
+            loads = orjson.loads if orjson else json.loads
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = loads(line)
+                    except ValueError:
+                        break  # partial line from an interrupted write
+                    manifest['downloaded_files'][record['key']] = record['entry']
+                    manifest['stats']['total_downloads'] += 1
+        return manifest
+    
+    def _journal_entry(self, file_hash: str, entry: Dict):
+        """Append one manifest entry to the journal. Caller holds the manifest lock."""
+        record = {'key': file_hash, 'entry': entry}
+        with open(self.journal_path, 'ab') as f:
+            f.write((orjson.dumps(record) if orjson else json.dumps(record).encode()) + b'\n')
     
     def _save_manifest(self):
-        """Save the manifest to disk."""
-        self.manifest['last_run'] = datetime.now().isoformat()
-        with open(self.manifest_path, 'w') as f:
-            json.dump(self.manifest, f, indent=2)
+        """
+        Compact the manifest into a JSON snapshot and truncate the journal.
+        
+        The snapshot is written to a temp file and renamed over the old one,
+        so a crash mid-write never leaves a partial manifest; the journal is
+        only removed once the new snapshot is in place.
+        """
+        temp_file = self.manifest_path.with_suffix('.tmp')
+        with self._manifest_lock:
+            self.manifest['last_run'] = datetime.now().isoformat()
+            if orjson:
+                with open(temp_file, 'wb') as f:
+                    f.write(orjson.dumps(self.manifest, option=orjson.OPT_INDENT_2 if PRETTY_MANIFEST else 0))
+            else:
+                with open(temp_file, 'w') as f:
+                    json.dump(self.manifest, f, indent=2 if PRETTY_MANIFEST else None)
+            os.replace(temp_file, self.manifest_path)
+            self.journal_path.unlink(missing_ok=True)
+    
+    def _open_page_cache(self) -> sqlite3.Connection:
+        """Open the SQLite cache of parsed data library pages."""
+        db = sqlite3.connect(self.data_dir / 'pages.sqlite', isolation_level=None, check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE IF NOT EXISTS pages '
+                   '(url TEXT PRIMARY KEY, etag TEXT, last_mod TEXT, links TEXT NOT NULL)')
+        return db
+    
+    def _print(self, message: str):
+        """Print one complete line, safe to call from worker threads."""
+        with self._print_lock:
+            print(message)
     
     def _get_file_hash(self, url: str) -> str:
         """Generate a unique hash for a file URL."""
-        return hashlib.md5(url.encode()).hexdigest()
+        return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    
+    def _index_files(self) -> Set[str]:
+        """Absolute paths of every file under data_dir, gathered in one directory walk."""
+        return {
+            os.path.abspath(os.path.join(root, name))
+            for root, _, files in os.walk(self.data_dir)
+            for name in files
+        }
+    
+    @staticmethod
+    def _url_key(url: str) -> int:
+        """64-bit integer digest of a URL for compact in-memory dedup sets."""
+        return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), 'big')
     
     def _is_duplicate(self, url: str, size: int = None) -> bool:
         """Check if a file has already been downloaded."""
         file_hash = self._get_file_hash(url)
         if file_hash in self.manifest['downloaded_files']:
             existing = self.manifest['downloaded_files'][file_hash]
-            # Check if file still exists locally
-            if Path(existing['local_path']).exists():
+            # Check if file still exists locally (per the startup directory index)
+            if os.path.abspath(existing['local_path']) in self._fs_index:
                 return True
         return False
     
+    def _match_forms(self, text: str) -> tuple:
+        """Return the target form types whose keywords appear in text."""
+        text_lower = text.lower()
+        return tuple(form_type for form_type, keywords in self._form_keywords.items()
+                     if any(keyword in text_lower for keyword in keywords))
+    
     def _matches_target_forms(self, text: str) -> List[str]:
         """Check if text matches any of our target form keywords."""
-        text_lower = text.lower()
-        matches = []
-        
-        for form_type, keywords in self.target_forms.items():
-            if any(keyword.lower() in text_lower for keyword in keywords):
-                matches.append(form_type)
-        
-        return matches
+        return list(self._match_forms_cached(text))
     
     def get_total_pages(self) -> int:
         """Determine the total number of pages in the data library."""
-        print("Determining total number of pages...")
+        self._print("Determining total number of pages...")
         
         try:
-            response = self.session.get(self.data_page, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for pagination info - "1 - 10 of 1667"
-            pagination_text = soup.find(text=re.compile(r'\d+\s*-\s*\d+\s+of\s+\d+'))
-            
-            if pagination_text:
-                match = re.search(r'of\s+(\d+)', pagination_text)
-                if match:
-                    total_items = int(match.group(1))
-                    # Assuming 10 items per page
-                    total_pages = (total_items + 9) // 10
-                    print(f"Found {total_items} total items across ~{total_pages} pages")
-                    return total_pages
+            max_page = None
+            self.rate_limiter.wait()
+            with self.session.get(self.data_page, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                
+                # Parse as the page streams in and stop reading once the count is found
+                for elem in _iter_html(response.iter_content(chunk_size=PARSE_CHUNK_BYTES)):
+                    # Look for pagination info - "1 - 10 of 1667" (text and child tails are complete here)
+                    for text in (elem.text, *(child.tail for child in elem)):
+                        if text and PAGINATION_RE.search(text):
+                            match = TOTAL_ITEMS_RE.search(text)
+                            if match:
+                                total_items = int(match.group(1))
+                                # Assuming 10 items per page
+                                total_pages = (total_items + 9) // 10
+                                self._print(f"Found {total_items} total items across ~{total_pages} pages")
+                                return total_pages
+                    
+                    # Fallback: remember the last page link from the first pager
+                    if (max_page is None and elem.tag in ('nav', 'ul')
+                            and 'pager' in elem.get('class', '').split()):
+                        pages = [int(m.group(1)) for a in elem.iter('a')
+                                 for m in [PAGE_PARAM_RE.search(a.get('href', ''))] if m]
+                        if pages:
+                            max_page = max(pages)
             
-            # Fallback: look for last page link
-            pager = soup.find('nav', class_='pager') or soup.find('ul', class_='pager')
-            if pager:
-                page_links = pager.find_all('a', href=re.compile(r'page=\d+'))
-                if page_links:
-                    max_page = max([int(re.search(r'page=(\d+)', a['href']).group(1)) 
-                                   for a in page_links if re.search(r'page=(\d+)', a['href'])])
-                    print(f"Found maximum page number: {max_page}")
-                    return max_page + 1  # Pages are 0-indexed
+            if max_page is not None:
+                self._print(f"Found maximum page number: {max_page}")
+                return max_page + 1  # Pages are 0-indexed
             
-            print("Could not determine total pages, will paginate until no more results")
+            self._print("Could not determine total pages, will paginate until no more results")
             return 999  # Fallback: try many pages
             
         except Exception as e:
-            print(f"Error determining page count: {e}")
+            self._print(f"Error determining page count: {e}")
             return 999  # Fallback
     
+    def _page_url(self, page: int) -> str:
+        """Build the URL of a (0-indexed) data library page."""
+        if page == 0:
+            return self.data_page
+        return f"{self.data_page}?page={page}"
+    
+    def _fetch_page_links(self, page: int) -> List[Dict]:
+        """
+        Fetch one data library page and extract its relevant file links.
+        
+        Sends a conditional GET using the validators cached from an earlier
+        run; on 304 Not Modified the cached links are returned unparsed.
+        
+        Args:
+            page: 0-indexed page number
+        
+        Returns:
+            List of dicts with url, title, form_types, and file_type
+        """
+        url = self._page_url(page)
+        with self._page_cache_lock:
+            cached = self._page_cache.execute(
+                'SELECT etag, last_mod, links FROM pages WHERE url = ?', (url,)
+            ).fetchone()
+        
+        headers = {}
+        if cached:
+            etag, last_mod, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_mod:
+                headers['If-Modified-Since'] = last_mod
+        
+        self.rate_limiter.wait()
+        with self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+            if response.status_code == 304 and cached:
+                return json.loads(cached[2])
+            response.raise_for_status()
+            
+            links = self._parse_page_links(response.iter_content(chunk_size=PARSE_CHUNK_BYTES))
+            
+            etag = response.headers.get('ETag')
+            last_mod = response.headers.get('Last-Modified')
+        if etag or last_mod:
+            with self._page_cache_lock:
+                self._page_cache.execute(
+                    'INSERT OR REPLACE INTO pages (url, etag, last_mod, links) VALUES (?, ?, ?, ?)',
+                    (url, etag, last_mod, json.dumps(links))
+                )
+        
+        return links
+    
+    def _parse_page_links(self, chunks: Iterable[bytes]) -> List[Dict]:
+        """
+        Extract relevant file links from a data library page body.
+        
+        The body is parsed incrementally and each element is discarded once
+        handled, so the tree never holds more than the currently open path.
+        
+        Args:
+            chunks: Page body as an iterable of byte chunks
+        
+        Returns:
+            List of dicts with url, title, form_types, and file_type
+        """
+        links = []
+        
+        for elem in _iter_html(chunks):
+            href = elem.get('href') if elem.tag == 'a' else None
+            # Lowercased href with any ?query/#fragment stripped, computed once
+            path = href.lower().split('?', 1)[0].split('#', 1)[0] if href else ''
+            
+            # Look for data files
+            if path.endswith(DATA_FILE_EXTENSIONS):
+                link_text = ''.join(elem.itertext()).strip()
+                form_matches = self._matches_target_forms(f"{link_text} {href}")
+            else:
+                form_matches = None
+                if next(elem.iterancestors('a'), None) is not None:
+                    continue  # still needed for the enclosing anchor's text
+            
+            # Free the finished element and any siblings already handled
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+            
+            if form_matches:
+                # Make URL absolute
+                if href.startswith('/'):
+                    full_url = f"{self.base_url}{href}"
+                elif not href.startswith('http'):
+                    full_url = f"{self.base_url}/{href}"
+                else:
+                    full_url = href
+                
+                links.append({
+                    'url': full_url,
+                    'title': link_text,
+                    'form_types': form_matches,
+                    'file_type': path.rsplit('.', 1)[-1]
+                })
+        
+        return links
+    
     def discover_data_links(self, max_pages: int = None) -> List[Dict]:
         """
         Discover all relevant data file links from all pages of the USCIS data library.
         
+        Pages are fetched concurrently by a pool of workers, but results are
+        processed in page order so the empty-page stop rule is unchanged.
+        When scraping all pages, the page-count probe runs alongside the first
+        page fetches instead of before them; pages are fetched unbounded until
+        it returns, then capped at its count.
+        
         Args:
             max_pages: Maximum number of pages to scrape (None = all pages)
         
@@ -147,84 +432,66 @@ class USCISScraper:
         print("DISCOVERING DATA FILES")
         print(f"{'='*80}\n")
         
-        if max_pages is None:
-            total_pages = self.get_total_pages()
-        else:
-            total_pages = max_pages
+        total_pages = max_pages  # None until the page-count probe returns
         
         discovered_links = []
-        seen_urls = set()
+        seen_urls: Set[int] = set()  # _url_key digests, not full URL strings
         
-        page = 0
         consecutive_empty_pages = 0
         max_empty_pages = 5  # Stop if we hit 5 empty pages in a row
         
-        while page < total_pages:
-            # Construct paginated URL
-            if page == 0:
-                url = self.data_page
-            else:
-                url = f"{self.data_page}?page={page}"
-            
-            print(f"[Page {page + 1}/{total_pages}] Scanning: {url}")
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            # Keep a bounded window of pages in flight ahead of the one being processed
+            pending = deque()
+            next_page = 0
+            probe = executor.submit(self.get_total_pages) if max_pages is None else None
             
-            try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
+            while True:
+                if probe is not None and probe.done():
+                    total_pages, probe = probe.result(), None
+                    # Drop pages queued past the now-known end
+                    while pending and pending[-1][0] >= total_pages:
+                        pending.pop()[1].cancel()
+                    next_page = min(next_page, total_pages)
                 
-                page_links = 0
+                while (total_pages is None or next_page < total_pages) and len(pending) < PAGE_WORKERS * 2:
+                    pending.append((next_page, executor.submit(self._fetch_page_links, next_page)))
+                    next_page += 1
+                if not pending:
+                    break
                 
-                # Find all links on this page
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    link_text = link.get_text(strip=True)
-                    
-                    # Look for data files
-                    if any(ext in href.lower() for ext in ['.xlsx', '.xls', '.csv', '.pdf', '.zip']):
-                        # Check if this link matches our target forms
-                        combined_text = f"{link_text} {href}"
-                        form_matches = self._matches_target_forms(combined_text)
-                        
-                        if form_matches:
-                            # Make URL absolute
-                            if href.startswith('/'):
-                                full_url = f"{self.base_url}{href}"
-                            elif not href.startswith('http'):
-                                full_url = f"{self.base_url}/{href}"
-                            else:
-                                full_url = href
-                            
-                            # Deduplicate
-                            if full_url not in seen_urls:
-                                seen_urls.add(full_url)
-                                discovered_links.append({
-                                    'url': full_url,
-                                    'title': link_text,
-                                    'form_types': form_matches,
-                                    'file_type': href.split('.')[-1].lower().split('?')[0],
-                                    'page': page + 1
-                                })
-                                page_links += 1
+                page, future = pending.popleft()
+                self._print(f"[Page {page + 1}/{total_pages or '?'}] Scanning: {self._page_url(page)}")
                 
-                print(f"  Found {page_links} new relevant files on this page (Total: {len(discovered_links)})")
+                try:
+                    page_candidates = future.result()
+                except requests.RequestException as e:
+                    self._print(f"  [ERROR] Failed to fetch page: {e}")
+                    continue
+                
+                page_links = 0
+                for link in page_candidates:
+                    # Deduplicate
+                    url_key = self._url_key(link['url'])
+                    if url_key not in seen_urls:
+                        seen_urls.add(url_key)
+                        link['page'] = page + 1
+                        discovered_links.append(link)
+                        page_links += 1
+                
+                self._print(f"  Found {page_links} new relevant files on this page (Total: {len(discovered_links)})")
                 
                 if page_links == 0:
                     consecutive_empty_pages += 1
                     if consecutive_empty_pages >= max_empty_pages:
                         print(f"\n  No relevant files found on last {max_empty_pages} pages. Stopping pagination.")
+                        for _, queued in pending:
+                            queued.cancel()
+                        if probe is not None:
+                            probe.cancel()
                         break
                 else:
                     consecutive_empty_pages = 0
-                
-                # Be polite to the server
-                time.sleep(0.5)
-                page += 1
-                
-            except requests.RequestException as e:
-                print(f"  [ERROR] Failed to fetch page: {e}")
-                page += 1
-                continue
         
         print(f"\n{'='*80}")
         print(f"DISCOVERY COMPLETE: Found {len(discovered_links)} unique relevant files")
@@ -232,17 +499,23 @@ class USCISScraper:
         
         return discovered_links
     
-    def download_file(self, url: str, form_types: List[str], title: str, file_type: str) -> bool:
+    def download_file(self, url: str, form_types: List[str], title: str, file_type: str,
+                      progress: str = '') -> bool:
         """
         Download a file if it hasn't been downloaded before.
         Returns True if downloaded, False if skipped.
+        
+        progress (e.g. "[3/40]") prefixes every output line, so lines from
+        concurrent downloads can be told apart.
         """
         file_hash = self._get_file_hash(url)
+        prefix = f"{progress} " if progress else "  "
         
         # Check for duplicates
         if self._is_duplicate(url):
-            print(f"  [SKIP] Already downloaded: {title[:60]}")
-            self.manifest['stats']['skipped_duplicates'] += 1
+            self._print(f"{prefix}[SKIP] Already downloaded: {title[:60]}")
+            with self._manifest_lock:
+                self.manifest['stats']['skipped_duplicates'] += 1
             return False
         
         # Create subdirectory for form type
@@ -250,60 +523,152 @@ class USCISScraper:
         form_dir = self.data_dir / primary_form
         form_dir.mkdir(exist_ok=True)
         
-        # Generate filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Generate filename; the URL hash keeps same-titled files in a batch apart
+        timestamp = self._run_ts or datetime.now().strftime('%Y%m%d_%H%M%S')
         safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
         safe_title = safe_title[:80]  # Limit length
-        filename = f"{safe_title}_{timestamp}.{file_type}"
+        filename = f"{safe_title}_{timestamp}_{file_hash[:8]}.{file_type}"
         filepath = form_dir / filename
         
         try:
-            print(f"  [DOWNLOAD] {title[:60]}")
-            
-            response = self.session.get(url, timeout=60, stream=True)
-            response.raise_for_status()
-            
-            # Download with progress
-            total_size = int(response.headers.get('content-length', 0))
-            with open(filepath, 'wb') as f:
-                if total_size == 0:
-                    f.write(response.content)
-                else:
-                    downloaded = 0
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                        downloaded += len(chunk)
-            
-            file_size = os.path.getsize(filepath)
-            print(f"    Saved: {filepath.name} ({file_size / 1024:.1f} KB)")
-            
-            # Update manifest
-            self.manifest['downloaded_files'][file_hash] = {
-                'url': url,
-                'title': title,
-                'form_types': form_types,
-                'local_path': str(filepath),
-                'download_date': datetime.now().isoformat(),
-                'file_size': file_size
-            }
-            self.manifest['stats']['total_downloads'] += 1
-            
+            self._print(f"{prefix}[DOWNLOAD] {title[:60]}")
+            self._fetch_and_record(file_hash, url, title, form_types, filepath, prefix)
             return True
             
         except requests.RequestException as e:
-            print(f"    [ERROR] Failed to download: {e}")
+            self._print(f"{prefix}[ERROR] Failed to download {title[:60]}: {e}")
             return False
         except Exception as e:
-            print(f"    [ERROR] Unexpected error: {e}")
+            self._print(f"{prefix}[ERROR] Unexpected error for {title[:60]}: {e}")
+            return False
+    
+    def _fetch_and_record(self, file_hash: str, url: str, title: str, form_types: List[str],
+                          filepath: Path, prefix: str = "  "):
+        """
+        Download url to filepath and record it in the manifest.
+        
+        The body is streamed to a temporary file that replaces filepath only
+        once complete, so a failed download never clobbers an existing copy
+        and the manifest is only updated on success. Raises on failure.
+        """
+        if self.download_limiter:
+            self.download_limiter.wait()
+        
+        temp_file = filepath.with_name(filepath.name + '.part')
+        try:
+            with self.session.get(url, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                
+                # Stream straight from the socket in large blocks
+                with open(temp_file, 'wb') as f:
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, f, length=COPY_BUFFER_BYTES)
+            os.replace(temp_file, filepath)
+        finally:
+            temp_file.unlink(missing_ok=True)
+        
+        file_size = os.path.getsize(filepath)
+        self._print(f"{prefix}Saved: {filepath.name} ({file_size / 1024:.1f} KB)")
+        
+        # Update manifest
+        entry = {
+            'url': url,
+            'title': title,
+            'form_types': form_types,
+            'local_path': str(filepath),
+            'download_date': datetime.now().isoformat(),
+            'file_size': file_size,
+            # Validators for later HEAD revalidation
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        with self._manifest_lock:
+            self.manifest['downloaded_files'][file_hash] = entry
+            self.manifest['stats']['total_downloads'] += 1
+            self._fs_index.add(os.path.abspath(filepath))
+            self._journal_entry(file_hash, entry)
+    
+    def _needs_refetch(self, entry: Dict) -> bool:
+        """
+        Check with a conditional HEAD whether a downloaded file changed upstream.
+        
+        Entries without stored validators, requests that fail, and responses
+        sharing no validator with the entry are treated as unchanged.
+        """
+        etag, last_modified = entry.get('etag'), entry.get('last_modified')
+        if not (etag or last_modified):
             return False
+        
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        try:
+            self.rate_limiter.wait()
+            response = self.session.head(entry['url'], headers=headers, timeout=30, allow_redirects=True)
+        except requests.RequestException:
+            return False
+        if response.status_code == 304 or not response.ok:
+            return False
+        
+        # Only a validator present on both sides can prove a change; one that
+        # appears or disappears says nothing about the content
+        new_etag = response.headers.get('ETag')
+        new_last_modified = response.headers.get('Last-Modified')
+        return bool((etag and new_etag and new_etag != etag)
+                    or (last_modified and new_last_modified and new_last_modified != last_modified))
     
-    def run(self, max_pages: int = None, delay_between_downloads: float = 1.0):
+    def _refresh(self, file_hash: str, entry: Dict) -> bool:
+        """
+        Re-download a changed file over its existing local copy.
+        
+        On failure the old file and its manifest entry are kept, so the next
+        revalidation tries again.
+        """
+        self._print(f"  [CHANGED] {entry['title'][:60]}")
+        filepath = Path(entry['local_path'])
+        try:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            self._fetch_and_record(file_hash, entry['url'], entry['title'], entry['form_types'], filepath)
+            return True
+        except (requests.RequestException, OSError) as e:
+            self._print(f"  [ERROR] Failed to refresh {entry['title'][:60]}: {e}")
+            return False
+    
+    def revalidate(self) -> int:
+        """
+        HEAD every downloaded file concurrently and re-download those that
+        changed upstream in place, straight from their manifest entries.
+        
+        Returns:
+            Number of files refreshed
+        """
+        entries = list(self.manifest['downloaded_files'].items())
+        print(f"Revalidating {len(entries)} downloaded files...")
+        
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            stale = [(file_hash, entry) for (file_hash, entry), changed in
+                     zip(entries, executor.map(lambda item: self._needs_refetch(item[1]), entries))
+                     if changed]
+        
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            refreshed = sum(executor.map(lambda item: self._refresh(*item), stale))
+        
+        print(f"Revalidation complete: {len(stale)} changed upstream, {refreshed} refreshed\n")
+        return refreshed
+    
+    def run(self, max_pages: int = None, delay_between_downloads: float = 1.0, revalidate: bool = False):
         """
         Main execution: discover links and download new files.
         
         Args:
             max_pages: Maximum pages to scrape (None = all pages)
-            delay_between_downloads: Seconds to wait between downloads
+            delay_between_downloads: Minimum seconds between download starts,
+                shared across all download workers
+            revalidate: HEAD previously downloaded files first and re-download
+                any whose ETag/Last-Modified changed
         """
         print("\n" + "=" * 80)
         print("USCIS IMMIGRATION FORMS DATA SCRAPER")
@@ -314,6 +679,13 @@ class USCISScraper:
         print(f"Target forms: {', '.join(self.target_forms.keys())}")
         print()
         
+        # The limiter spaces download starts, including revalidation re-fetches
+        self.download_limiter = (RateLimiter(1.0 / delay_between_downloads)
+                                 if delay_between_downloads > 0 else None)
+        
+        if revalidate:
+            self.revalidate()
+        
         # Discover all data links across all pages
         links = self.discover_data_links(max_pages=max_pages)
         
@@ -326,27 +698,25 @@ class USCISScraper:
         print(f"{'='*80}\n")
         print(f"Processing {len(links)} files...\n")
         
-        # Download each file
-        downloaded_count = 0
-        for i, link in enumerate(links, 1):
-            print(f"[{i}/{len(links)}] {link['title'][:60]}")
-            
-            success = self.download_file(
+        def download(indexed_link):
+            i, link = indexed_link
+            return self.download_file(
                 url=link['url'],
                 form_types=link['form_types'],
                 title=link['title'],
-                file_type=link['file_type']
+                file_type=link['file_type'],
+                progress=f"[{i}/{len(links)}]"
             )
-            
-            if success:
-                downloaded_count += 1
-                time.sleep(delay_between_downloads)
-            
-            # Save manifest periodically (every 10 downloads)
-            if downloaded_count > 0 and downloaded_count % 10 == 0:
-                self._save_manifest()
         
-        # Final manifest save
+        # One timestamp for every file in this batch
+        self._run_ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        # Download files concurrently; each download is journaled as it
+        # completes, so no periodic rewrites
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            downloaded_count = sum(executor.map(download, enumerate(links, 1)))
+        
+        # Compact the journal into the manifest snapshot
         self._save_manifest()
         
         # Print summary
@@ -359,18 +729,24 @@ class USCISScraper:
         print(f"Total historical downloads: {self.manifest['stats']['total_downloads']}")
         print(f"Data saved to: {self.data_dir.absolute()}")
         print(f"Manifest: {self.manifest_path}")
+        print(f"Form match cache: {self._match_forms_cached.cache_info()}")
         print(f"{'='*80}\n")
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Download USCIS immigration forms data files.")
+    parser.add_argument('--revalidate', action='store_true',
+                        help="HEAD previously downloaded files and re-download any that changed")
+    args = parser.parse_args()
+    
     scraper = USCISScraper(
         data_dir="./uscis_data",
         manifest_file="download_manifest.json"
     )
     
     # Run with all pages (set max_pages=10 to test with first 10 pages only)
-    scraper.run(max_pages=None, delay_between_downloads=1.0)
+    scraper.run(max_pages=None, delay_between_downloads=1.0, revalidate=args.revalidate)
 
 
 if __name__ == "__main__":